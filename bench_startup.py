@@ -0,0 +1,55 @@
+import sys
+import os
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+
+# 起動時間ベンチマーク:
+# 遅延起動 (既定) と従来の一括起動 (--eager-startup) でウィンドウ表示までの時間を比べる
+
+MAIN = os.path.join(os.path.dirname(os.path.abspath(__file__)), "main.py")
+
+def run_once(eager):
+    with tempfile.TemporaryDirectory() as tmp:
+        trace_path = os.path.join(tmp, "trace.json")
+        command = [sys.executable, MAIN, "--trace-startup", trace_path, "--quit-after-startup"]
+        if eager:
+            command.append("--eager-startup")
+        env = dict(os.environ)
+        env.setdefault("QT_QPA_PLATFORM", "offscreen")
+        subprocess.run(command, env=env, check=True, timeout=120,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        with open(trace_path, 'r', encoding='utf-8') as f:
+            trace = json.load(f)
+    marks = trace["marks"]
+    return marks.get("first_paint", marks["window_shown"]), marks["startup_complete"]
+
+def measure(eager, runs):
+    results = [run_once(eager) for _ in range(runs)]
+    return (statistics.median(r[0] for r in results),
+            statistics.median(r[1] for r in results))
+
+def main():
+    parser = argparse.ArgumentParser(description="Shichiha Browser 起動時間ベンチマーク")
+    parser.add_argument("--runs", type=int, default=5, help="各モードの試行回数")
+    args = parser.parse_args()
+
+    # 1回目はディスクキャッシュの影響が大きいので捨てる
+    run_once(False)
+
+    eager_window, eager_complete = measure(True, args.runs)
+    deferred_window, deferred_complete = measure(False, args.runs)
+
+    print(f"一括起動: ウィンドウ表示 {eager_window:.1f} ms / 起動完了 {eager_complete:.1f} ms")
+    print(f"遅延起動: ウィンドウ表示 {deferred_window:.1f} ms / 起動完了 {deferred_complete:.1f} ms")
+    print(f"ウィンドウ表示までの短縮: {eager_window - deferred_window:.1f} ms")
+
+    if deferred_window >= eager_window:
+        print("遅延起動でウィンドウ表示が速くなっていません", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -3,16 +3,49 @@ import json
 import re
 import os
 import importlib.util
+import shutil
+import argparse
+import sqlite3
+import hashlib
+import threading
+import queue
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import datetime
 from urllib.parse import urlparse
+from urllib.request import pathname2url
+
+# 起動トレースの基準時刻 (QtWebEngineのimportより前に記録する)
+_STARTUP_ORIGIN = time.perf_counter()
+
 from PyQt5.QtWidgets import (QApplication, QMainWindow, QVBoxLayout, QHBoxLayout, 
                              QLineEdit, QWidget, QPushButton, QTabWidget, QToolButton,
-                             QMenu, QMessageBox, QProgressBar, QFileDialog, QStyleFactory)
-from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEngineProfile, QWebEngineSettings
-from PyQt5.QtCore import QUrl, Qt, QTimer, QObject, pyqtSlot, QStandardPaths
-from PyQt5.QtGui import QIcon, QPalette, QColor
-from PyQt5.QtNetwork import QNetworkRequest
+                             QMenu, QMessageBox, QProgressBar, QFileDialog, QStyleFactory,
+                             QDialog, QLabel, QListWidget, QListWidgetItem)
+from PyQt5.QtWebEngineWidgets import QWebEngineView, QWebEnginePage, QWebEngineProfile, QWebEngineSettings
+from PyQt5.QtCore import (QUrl, Qt, QTimer, QObject, pyqtSlot, pyqtSignal, QStandardPaths, QSettings,
+                          QSize, QBuffer, QByteArray, QIODevice)
+from PyQt5.QtGui import QIcon, QPalette, QColor, QImage, QPixmap
+from PyQt5.QtNetwork import QNetworkRequest, QNetworkAccessManager
 from PyQt5.QtWebEngineCore import QWebEngineUrlRequestInterceptor
 
+_IMPORTS_FINISHED = time.perf_counter()
+
+HOME_URL = "https://www.google.com"
+
+# アドブロッカーのブロック対象
+BLOCKED_URLS = [
+    "*://*.doubleclick.net/*",
+    "*://*.googleadservices.com/*",
+    "*://*.googlesyndication.com/*",
+    "*://*.adservice.google.com/*",
+    "*://*.adbrite.com/*",
+    "*://*.exponential.com/*",
+    "*://*.quantserve.com/*",
+    "*://*.scorecardresearch.com/*"
+]
+
 class AdBlocker(QWebEngineUrlRequestInterceptor):
     def __init__(self, blocked_urls):
         super().__init__()
@@ -25,6 +58,80 @@ class AdBlocker(QWebEngineUrlRequestInterceptor):
                 info.block(True)
                 break
 
+_default_profile_ready = False
+_ad_blocker = None
+
+def setup_default_profile():
+    # 通常タブ共通のプロファイル設定 (タブごとではなく一度だけ行う)
+    global _default_profile_ready, _ad_blocker
+    if _default_profile_ready:
+        return
+    _default_profile_ready = True
+    profile = QWebEngineProfile.defaultProfile()
+    
+    # キャッシュとプロファイル設定
+    profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
+    profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
+    cache_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "web_cache")
+    storage_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.DataLocation), "web_storage")
+    profile.setCachePath(cache_path)
+    profile.setPersistentStoragePath(storage_path)
+    
+    # アドブロッカー
+    _ad_blocker = AdBlocker(BLOCKED_URLS)
+    profile.setUrlRequestInterceptor(_ad_blocker)
+
+class StartupTrace:
+    # 起動の各フェーズの時間を記録し、JSONで書き出す
+    def __init__(self, path=None, origin=None):
+        self.path = path
+        self.origin = origin if origin is not None else time.perf_counter()
+        self.phases = []
+        self.marks = {}
+        self.written = False
+
+    def add(self, name, start, end):
+        self.phases.append((name, start, end))
+
+    @contextmanager
+    def phase(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.add(name, start, time.perf_counter())
+
+    def mark(self, name):
+        self.marks.setdefault(name, time.perf_counter())
+
+    def to_ms(self, t):
+        return round((t - self.origin) * 1000, 3)
+
+    def to_dict(self):
+        return {
+            "phases": [
+                {
+                    "name": name,
+                    "start_ms": self.to_ms(start),
+                    "end_ms": self.to_ms(end),
+                    "duration_ms": round((end - start) * 1000, 3),
+                }
+                for name, start, end in self.phases
+            ],
+            "marks": {name: self.to_ms(t) for name, t in self.marks.items()},
+        }
+
+    def write(self):
+        if self.written or not self.path:
+            return
+        self.written = True
+        data = json.dumps(self.to_dict(), ensure_ascii=False, indent=2)
+        if self.path == "-":
+            print(data)
+        else:
+            with open(self.path, 'w', encoding='utf-8') as f:
+                f.write(data + "\n")
+
 class PrivacyManager(QObject):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -43,6 +150,635 @@ class PrivacyManager(QObject):
             profile = QWebEngineProfile.defaultProfile()
         return profile
 
+class PageIndexStore:
+    # 1ページあたりに保存する本文の最大文字数
+    MAX_TEXT_LENGTH = 200000
+
+    # 容量上限に達したら、上限のこの割合まで減らす
+    EVICT_TARGET = 0.9
+    # 削除後の索引の詰め直しで書き込むページ数の上限
+    MERGE_PAGES = 2000
+    # 短い語だけの検索 (LIKE) で走査する最近のページ数
+    SHORT_TERM_SCAN_LIMIT = 5000
+
+    def __init__(self, path, max_bytes=256 * 1024 * 1024, read_only=False):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.tokenizer = None
+        self.total_size = 0
+        if read_only:
+            # 検索用: スキーマ作成などの書き込みは一切しない
+            self.conn = sqlite3.connect(f"file:{pathname2url(path)}?mode=ro", uri=True, timeout=10)
+            return
+        self.conn = sqlite3.connect(path, timeout=10)
+        # 削除で空いたページをファイルから返せるようにする (テーブル作成前でないと効かない)
+        self.conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA journal_size_limit=16777216")
+        self.conn.execute("PRAGMA synchronous=NORMAL")
+        with self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    id INTEGER PRIMARY KEY,
+                    url TEXT UNIQUE NOT NULL,
+                    title TEXT,
+                    content_hash TEXT NOT NULL,
+                    size INTEGER NOT NULL,
+                    visited REAL NOT NULL
+                )
+            """)
+            self.conn.execute("CREATE INDEX IF NOT EXISTS pages_hash ON pages(content_hash)")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS pages_visited ON pages(visited)")
+            self.tokenizer = self.create_fts_table()
+        self.total_size = self.conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+
+    def create_fts_table(self):
+        # 日本語は単語区切りがないため、使える場合はtrigramで部分一致検索する
+        try:
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(title, body, tokenize='trigram')")
+        except sqlite3.OperationalError:
+            self.conn.execute(
+                "CREATE VIRTUAL TABLE IF NOT EXISTS pages_fts USING fts5(title, body, tokenize='unicode61')")
+        return self.detect_tokenizer()
+
+    def detect_tokenizer(self):
+        row = self.conn.execute(
+            "SELECT sql FROM sqlite_master WHERE name = 'pages_fts'").fetchone()
+        return "trigram" if row and "trigram" in row[0] else "unicode61"
+
+    def database_size(self):
+        # 全文索引とWALを含むディスク上のサイズ
+        page_count = self.conn.execute("PRAGMA page_count").fetchone()[0]
+        page_size = self.conn.execute("PRAGMA page_size").fetchone()[0]
+        wal_path = self.path + "-wal"
+        wal_size = os.path.getsize(wal_path) if os.path.exists(wal_path) else 0
+        return page_count * page_size + wal_size
+
+    def add_page(self, url, title, text):
+        body = " ".join(text[:self.MAX_TEXT_LENGTH].split())
+        if not body:
+            return False
+        content_hash = hashlib.sha1(body.encode('utf-8')).hexdigest()
+        now = time.time()
+
+        with self.conn:
+            row = self.conn.execute(
+                "SELECT id, content_hash, title FROM pages WHERE url = ?", (url,)).fetchone()
+            if row and row[1] == content_hash:
+                # 内容に変化なし: 訪問日時と (変わっていれば) タイトルのみ更新
+                self.conn.execute("UPDATE pages SET title = ?, visited = ? WHERE id = ?",
+                                  (title, now, row[0]))
+                if title != row[2]:
+                    self.conn.execute("UPDATE pages_fts SET title = ? WHERE rowid = ?",
+                                      (title, row[0]))
+                return False
+            if row:
+                self.delete_page(row[0])
+
+            duplicate = self.conn.execute(
+                "SELECT id FROM pages WHERE content_hash = ?", (content_hash,)).fetchone()
+            if duplicate:
+                # 同じ内容は別URLでも二重に保存しない
+                self.conn.execute("UPDATE pages SET visited = ? WHERE id = ?", (now, duplicate[0]))
+                return False
+
+            size = len(body.encode('utf-8'))
+            cursor = self.conn.execute(
+                "INSERT INTO pages (url, title, content_hash, size, visited) VALUES (?, ?, ?, ?, ?)",
+                (url, title, content_hash, size, now))
+            self.conn.execute("INSERT INTO pages_fts (rowid, title, body) VALUES (?, ?, ?)",
+                              (cursor.lastrowid, title, body))
+            self.total_size += size
+        self.evict()
+        return True
+
+    def delete_page(self, page_id):
+        row = self.conn.execute("SELECT size FROM pages WHERE id = ?", (page_id,)).fetchone()
+        if not row:
+            return
+        self.conn.execute("DELETE FROM pages WHERE id = ?", (page_id,))
+        self.conn.execute("DELETE FROM pages_fts WHERE rowid = ?", (page_id,))
+        self.total_size -= row[0]
+
+    def evict(self):
+        # 容量上限を超えたら古い訪問順に削除
+        db_size = self.database_size()
+        if db_size <= self.max_bytes or not self.total_size:
+            return
+        # 索引は本文より何倍も大きいので、本文1バイトあたりのファイルサイズで削除量を見積もる
+        ratio = db_size / self.total_size
+        text_to_free = (db_size - self.max_bytes * self.EVICT_TARGET) / ratio
+        target_size = self.total_size - text_to_free
+        with self.conn:
+            while self.total_size > target_size:
+                rows = self.conn.execute(
+                    "SELECT id FROM pages ORDER BY visited LIMIT 100").fetchall()
+                if not rows:
+                    break
+                for (page_id,) in rows:
+                    self.delete_page(page_id)
+                    if self.total_size <= target_size:
+                        break
+            # FTS5の削除は墓標として残るので、セグメントを併合して領域を空ける
+            # (optimizeは索引全体を書き直すので使わず、書き込み量を制限した併合にする)
+            self.conn.execute("INSERT INTO pages_fts (pages_fts, rank) VALUES ('merge', ?)",
+                              (-self.MERGE_PAGES,))
+        # executeでは1ページずつしか解放されないのでexecutescriptで最後まで実行する
+        self.conn.executescript("PRAGMA incremental_vacuum;")
+        # 併合で膨らんだWALを書き戻して切り詰める
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def search(self, query, limit=50):
+        terms = query.split()
+        if not terms:
+            return []
+        if self.tokenizer is None:
+            self.tokenizer = self.detect_tokenizer()
+        short_terms = []
+        if self.tokenizer == "trigram":
+            # trigramのMATCHは3文字未満の語を扱えないので、短い語 (「検索」など) はLIKEで絞り込む
+            short_terms = [t for t in terms if len(t) < 3]
+            terms = [t for t in terms if len(t) >= 3]
+
+        conditions = []
+        params = []
+        if terms:
+            conditions.append("pages_fts MATCH ?")
+            params.append(" ".join('"' + t.replace('"', '""') + '"' for t in terms))
+        for term in short_terms:
+            pattern = "%" + term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_") + "%"
+            conditions.append("(pages_fts.title LIKE ? ESCAPE '\\' OR pages_fts.body LIKE ? ESCAPE '\\')")
+            params.extend([pattern, pattern])
+
+        if terms:
+            snippet = "snippet(pages_fts, 1, '【', '】', '…', 16)"
+            source = "pages_fts JOIN pages p ON p.id = pages_fts.rowid"
+            order = "bm25(pages_fts, 5.0, 1.0)"
+        else:
+            # MATCHがないとsnippet()は使えないので、最初の一致箇所の前後を切り出す
+            snippet = "'…' || substr(pages_fts.body, max(instr(pages_fts.body, ?) - 20, 1), 60) || '…'"
+            params.insert(0, short_terms[0])
+            # LIKEは全件走査になるので、最近訪れたページに限る
+            source = (f"(SELECT id, url, title, visited FROM pages ORDER BY visited DESC "
+                      f"LIMIT {self.SHORT_TERM_SCAN_LIMIT}) p "
+                      f"JOIN pages_fts ON pages_fts.rowid = p.id")
+            order = "p.visited DESC"
+        try:
+            return self.conn.execute(f"""
+                SELECT p.url, p.title, {snippet}, p.visited
+                FROM {source}
+                WHERE {" AND ".join(conditions)}
+                ORDER BY {order}
+                LIMIT ?
+            """, params + [limit]).fetchall()
+        except sqlite3.OperationalError as e:
+            print(f"検索エラー: {e}")
+            return []
+
+    def clear(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM pages")
+            self.conn.execute("DELETE FROM pages_fts")
+        self.total_size = 0
+        self.conn.executescript("PRAGMA incremental_vacuum;")
+        self.conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+
+    def close(self):
+        self.conn.close()
+
+class PageIndexer(QObject):
+    # 検索結果 (要求番号, 結果, 所要ミリ秒)。検索ワーカーからキュー接続で届く
+    search_finished = pyqtSignal(int, object, float)
+
+    _instance = None
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = PageIndexer()
+            QApplication.instance().aboutToQuit.connect(cls._instance.shutdown)
+        return cls._instance
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.db_path = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.AppDataLocation), "page_index.sqlite3")
+        self.settings = QSettings()
+        self.enabled = self.settings.value("page_index/enabled", False, type=bool)
+        self.max_bytes = self.settings.value("page_index/max_mb", 256, type=int) * 1024 * 1024
+        self.queue = queue.Queue(maxsize=256)
+        self.worker = None
+        self.search_queue = queue.Queue()
+        self.search_worker = None
+        self.search_serial = 0
+
+    def set_enabled(self, enable):
+        self.enabled = enable
+        self.settings.setValue("page_index/enabled", enable)
+
+    def index_tab(self, tab):
+        # プライベートタブは絶対にインデックスしない
+        if not self.enabled or tab.private_mode:
+            return
+        url = tab.web_view.url().toString()
+        if not url.startswith(('http://', 'https://')):
+            return
+        title = tab.web_view.title()
+        tab.web_view.page().toPlainText(lambda text: self.enqueue(url, title, text))
+
+    def enqueue(self, url, title, text):
+        if not self.enabled or not text:
+            return
+        self.start_worker()
+        try:
+            self.queue.put_nowait((url, title, text))
+        except queue.Full:
+            pass
+
+    def start_worker(self):
+        if self.worker is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self.worker = threading.Thread(target=self.run_worker, name="PageIndexer", daemon=True)
+            self.worker.start()
+
+    def run_worker(self):
+        # 書き込みはUIスレッド外の専用接続で行う
+        try:
+            store = PageIndexStore(self.db_path, self.max_bytes)
+        except Exception as e:
+            # 次のenqueueでワーカーを作り直す
+            print(f"インデックス初期化エラー: {e}")
+            self.worker = None
+            return
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                if item == "clear":
+                    store.clear()
+                else:
+                    store.add_page(*item)
+            except Exception as e:
+                print(f"インデックスエラー: {e}")
+        store.close()
+
+    def search(self, query):
+        # 検索はUIスレッドを止めないよう専用スレッドで行い、結果はsearch_finishedで返す
+        self.search_serial += 1
+        if self.search_worker is None:
+            self.search_worker = threading.Thread(
+                target=self.run_search_worker, name="PageSearch", daemon=True)
+            self.search_worker.start()
+        self.search_queue.put((self.search_serial, query))
+        return self.search_serial
+
+    def run_search_worker(self):
+        store = None
+        while True:
+            item = self.search_queue.get()
+            # 入力中に溜まった古い検索は飛ばし、最新のものだけ実行する
+            while item is not None:
+                try:
+                    item = self.search_queue.get_nowait()
+                except queue.Empty:
+                    break
+            if item is None:
+                break
+            request_id, query = item
+            start = time.perf_counter()
+            try:
+                if store is None:
+                    # 読み取り専用の接続 (WALなので書き込みと並行可能)
+                    store = PageIndexStore(self.db_path, read_only=True)
+                results = store.search(query)
+            except sqlite3.Error as e:
+                # まだインデックスが作られていない等。次回開き直す
+                print(f"検索エラー: {e}")
+                results = []
+                store = None
+            self.search_finished.emit(request_id, results, (time.perf_counter() - start) * 1000)
+        if store is not None:
+            store.close()
+
+    def clear(self):
+        # 書き込み用接続の容量計算を狂わせないよう、削除もワーカー経由で行う
+        self.start_worker()
+        self.queue.put("clear")
+
+    def shutdown(self):
+        if self.search_worker is not None:
+            self.search_queue.put(None)
+            self.search_worker.join(2)
+            self.search_worker = None
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join(2)
+            self.worker = None
+
+class IconCache(QObject):
+    # ワーカースレッドからUIスレッドへの通知 (キュー接続)。floatはディスク上の更新日時
+    image_loaded = pyqtSignal(str, QImage, float)
+    fetch_needed = pyqtSignal(str, str)
+    # キャッシュに画像が入った (キーは "icon:ホスト" / "thumb:ホスト")
+    updated = pyqtSignal(str)
+
+    _instance = None
+
+    ICON_SIZE = 32
+    THUMBNAIL_SIZE = QSize(192, 120)
+    # この日数を過ぎたファビコンは次の訪問時に取り直す
+    MAX_ICON_AGE = 7 * 24 * 3600
+    MAX_THUMBNAILS = 2000
+
+    @classmethod
+    def instance(cls):
+        if cls._instance is None:
+            cls._instance = IconCache()
+            QApplication.instance().aboutToQuit.connect(cls._instance.shutdown)
+        return cls._instance
+
+    @staticmethod
+    def host_of(url):
+        return urlparse(url).netloc.lower()
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.db_path = os.path.join(
+            QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "icon_cache.sqlite3")
+        settings = QSettings()
+        self.max_memory = settings.value("icon_cache/memory_mb", 32, type=int) * 1024 * 1024
+        self.memory = OrderedDict()
+        self.memory_used = 0
+        self.loading = set()
+        self.missing = set()
+        # キーごとのディスク上の更新日時 (取得失敗の記録を含む)
+        self.updated_at = {}
+        self.fetching = set()
+        # QNetworkAccessManagerの生成はベアラプラグインの読み込みで重いので、初回取得時まで遅らせる
+        self.network = None
+        self.queue = queue.Queue()
+        self.worker = None
+        self.image_loaded.connect(self.on_image_loaded)
+        self.fetch_needed.connect(self.fetch_icon)
+
+    def icon(self, host):
+        pixmap = self.lookup("icon:" + host)
+        return QIcon(pixmap) if pixmap else None
+
+    def thumbnail(self, host):
+        return self.lookup("thumb:" + host)
+
+    def lookup(self, key):
+        if key in self.memory:
+            self.memory.move_to_end(key)
+            return self.memory[key]
+        # 未デコードならディスクから非同期に読み込み、完了時にupdatedを出す (ネットワークには出ない)
+        if key not in self.loading and key not in self.missing:
+            self.loading.add(key)
+            self.send(("load", key))
+        return None
+
+    def update_icon(self, host, icon_url=""):
+        # 取得済みで新しければ何もしない (再検証はワーカーで判定)
+        key = "icon:" + host
+        # メモリにある (または取得失敗を記録済みの) 新しいエントリならディスクも見ない
+        fresh = time.time() - self.updated_at.get(key, 0) <= self.MAX_ICON_AGE
+        if fresh and (key in self.memory or key in self.missing):
+            return
+        if key not in self.fetching:
+            self.send(("check", key, icon_url or f"https://{host}/favicon.ico"))
+
+    def store_thumbnail(self, host, pixmap):
+        if pixmap.isNull():
+            return
+        thumb = pixmap.scaled(self.THUMBNAIL_SIZE, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        self.missing.discard("thumb:" + host)
+        self.updated_at["thumb:" + host] = time.time()
+        self.remember("thumb:" + host, thumb)
+        self.updated.emit("thumb:" + host)
+        self.send(("store_image", "thumb:" + host, thumb.toImage()))
+
+    def fetch_icon(self, key, url):
+        if key in self.fetching:
+            return
+        self.fetching.add(key)
+        if self.network is None:
+            self.network = QNetworkAccessManager(self)
+        request = QNetworkRequest(QUrl(url))
+        request.setAttribute(QNetworkRequest.FollowRedirectsAttribute, True)
+        reply = self.network.get(request)
+        reply.finished.connect(lambda: self.icon_fetched(key, reply))
+
+    def icon_fetched(self, key, reply):
+        self.fetching.discard(key)
+        if reply.error() == reply.NoError:
+            # デコードと縮小はワーカーで行う
+            self.send(("store", key, bytes(reply.readAll())))
+        else:
+            # 失敗も記録して、MAX_ICON_AGEが過ぎるまで取り直さない
+            self.send(("store", key, b""))
+        reply.deleteLater()
+
+    def on_image_loaded(self, key, image, updated):
+        self.loading.discard(key)
+        if updated:
+            self.updated_at[key] = updated
+        if image.isNull():
+            if key not in self.memory:
+                self.missing.add(key)
+            return
+        self.missing.discard(key)
+        self.remember(key, QPixmap.fromImage(image))
+        self.updated.emit(key)
+
+    def remember(self, key, pixmap):
+        if key in self.memory:
+            self.memory_used -= self.pixmap_cost(self.memory.pop(key))
+        self.memory[key] = pixmap
+        self.memory_used += self.pixmap_cost(pixmap)
+        while self.memory_used > self.max_memory and len(self.memory) > 1:
+            _, old = self.memory.popitem(last=False)
+            self.memory_used -= self.pixmap_cost(old)
+
+    @staticmethod
+    def pixmap_cost(pixmap):
+        return pixmap.width() * pixmap.height() * max(pixmap.depth(), 8) // 8
+
+    def send(self, item):
+        if self.worker is None:
+            os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
+            self.worker = threading.Thread(target=self.run_worker, name="IconCache", daemon=True)
+            self.worker.start()
+        self.queue.put(item)
+
+    def run_worker(self):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS entries (
+                    key TEXT PRIMARY KEY,
+                    data BLOB NOT NULL,
+                    updated REAL NOT NULL
+                )
+            """)
+        while True:
+            item = self.queue.get()
+            if item is None:
+                break
+            try:
+                self.handle(conn, item)
+            except Exception as e:
+                print(f"アイコンキャッシュエラー: {e}")
+        conn.close()
+
+    def handle(self, conn, item):
+        op, key = item[0], item[1]
+        if op == "load":
+            row = conn.execute("SELECT data, updated FROM entries WHERE key = ?", (key,)).fetchone()
+            # 空のデータは取得失敗の記録
+            image = QImage.fromData(row[0]) if row and row[0] else QImage()
+            self.image_loaded.emit(key, image, row[1] if row else 0.0)
+        elif op == "check":
+            row = conn.execute("SELECT updated FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or time.time() - row[0] > self.MAX_ICON_AGE:
+                self.fetch_needed.emit(key, item[2])
+            else:
+                # 新しい: ディスクの内容をそのまま使う
+                self.handle(conn, ("load", key))
+        elif op == "store":
+            image = QImage.fromData(item[2]) if item[2] else QImage()
+            if image.isNull():
+                # 404や画像でない応答も、空のエントリとして記録する (取得済みの画像があれば残す)
+                now = time.time()
+                with conn:
+                    conn.execute("""
+                        INSERT INTO entries (key, data, updated) VALUES (?, ?, ?)
+                        ON CONFLICT(key) DO UPDATE SET updated = excluded.updated
+                    """, (key, b"", now))
+                self.image_loaded.emit(key, image, now)
+                return
+            if image.width() > self.ICON_SIZE or image.height() > self.ICON_SIZE:
+                image = image.scaled(self.ICON_SIZE, self.ICON_SIZE,
+                                     Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            updated = self.write(conn, key, image, "PNG")
+            self.image_loaded.emit(key, image, updated)
+        elif op == "store_image":
+            self.write(conn, key, item[2], "JPG")
+            with conn:
+                conn.execute("""
+                    DELETE FROM entries WHERE key IN (
+                        SELECT key FROM entries WHERE key LIKE 'thumb:%'
+                        ORDER BY updated DESC LIMIT -1 OFFSET ?
+                    )
+                """, (self.MAX_THUMBNAILS,))
+
+    def write(self, conn, key, image, fmt):
+        data = QByteArray()
+        buffer = QBuffer(data)
+        buffer.open(QIODevice.WriteOnly)
+        image.save(buffer, fmt, 80)
+        buffer.close()
+        updated = time.time()
+        with conn:
+            conn.execute("INSERT OR REPLACE INTO entries (key, data, updated) VALUES (?, ?, ?)",
+                         (key, bytes(data), updated))
+        return updated
+
+    def shutdown(self):
+        if self.worker is not None:
+            self.queue.put(None)
+            self.worker.join(2)
+            self.worker = None
+
+    def reset(self):
+        # キャッシュディレクトリを消す前に呼ぶ: 接続を閉じ、メモリ上の状態も捨てる
+        # (ワーカーは次の要求で作り直され、テーブルも作り直す)
+        self.shutdown()
+        self.queue = queue.Queue()
+        self.memory.clear()
+        self.memory_used = 0
+        self.loading.clear()
+        self.missing.clear()
+        self.updated_at.clear()
+
+class PageSearchDialog(QDialog):
+    def __init__(self, browser):
+        super().__init__(browser)
+        self.browser = browser
+        self.setWindowTitle("閲覧ページの全文検索")
+        self.resize(700, 500)
+
+        layout = QVBoxLayout(self)
+        self.query_edit = QLineEdit()
+        self.query_edit.setPlaceholderText("検索語を入力...")
+        layout.addWidget(self.query_edit)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+        self.result_list = QListWidget()
+        self.result_list.setWordWrap(True)
+        self.result_list.setIconSize(QSize(96, 60))
+        self.result_list.itemActivated.connect(self.open_result)
+        layout.addWidget(self.result_list, stretch=1)
+
+        # 入力中は検索を間引く
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(150)
+        self.search_timer.timeout.connect(self.run_search)
+        self.query_edit.textChanged.connect(self.search_timer.start)
+        IconCache.instance().updated.connect(self.on_icon_cache_updated)
+        self.search_id = None
+        PageIndexer.instance().search_finished.connect(self.show_results)
+
+        if not PageIndexer.instance().enabled:
+            self.status_label.setText("インデックスは無効です（設定メニューから有効にできます）")
+
+    def run_search(self):
+        query = self.query_edit.text().strip()
+        if not query:
+            self.search_id = None
+            self.result_list.clear()
+            self.status_label.clear()
+            return
+        self.search_id = PageIndexer.instance().search(query)
+        self.status_label.setText("検索中...")
+
+    def show_results(self, request_id, results, elapsed):
+        # 入力が進んだ後に届いた古い結果は捨てる
+        if request_id != self.search_id:
+            return
+        self.result_list.clear()
+        for url, title, snippet, visited in results:
+            item = QListWidgetItem(f"{title or url}\n{snippet}")
+            item.setToolTip(url)
+            item.setData(Qt.UserRole, url)
+            self.set_item_icon(item)
+            self.result_list.addItem(item)
+        status = f"{len(results)}件 ({elapsed:.1f} ms)"
+        if all(len(term) < 3 for term in self.query_edit.text().split()):
+            status += f" ※2文字以下の語だけの検索は最近の{PageIndexStore.SHORT_TERM_SCAN_LIMIT}ページが対象です"
+        self.status_label.setText(status)
+
+    def set_item_icon(self, item):
+        icon_cache = IconCache.instance()
+        host = IconCache.host_of(item.data(Qt.UserRole))
+        thumbnail = icon_cache.thumbnail(host)
+        if thumbnail:
+            item.setIcon(QIcon(thumbnail))
+        else:
+            item.setIcon(icon_cache.icon(host) or QIcon())
+
+    def on_icon_cache_updated(self, key):
+        for i in range(self.result_list.count()):
+            self.set_item_icon(self.result_list.item(i))
+
+    def open_result(self, item):
+        self.browser.add_new_tab(item.data(Qt.UserRole))
+
 class GestureWebView(QWebEngineView):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -157,31 +893,14 @@ class OptimizedBrowserTab(QWidget):
             settings.setAttribute(QWebEngineSettings.LocalStorageEnabled, True)
             settings.setAttribute(QWebEngineSettings.PluginsEnabled, False)
             settings.setAttribute(QWebEngineSettings.FullScreenSupportEnabled, False)
+            # ファビコンはIconCacheがホストごとに一度だけ取得する
             settings.setAttribute(QWebEngineSettings.AutoLoadIconsForPage, False)
             settings.setAttribute(QWebEngineSettings.XSSAuditingEnabled, True)
             settings.setAttribute(QWebEngineSettings.JavascriptCanAccessClipboard, False)
             settings.setAttribute(QWebEngineSettings.LocalContentCanAccessRemoteUrls, False)
             
-            # キャッシュとプロファイル設定
-            profile.setHttpCacheType(QWebEngineProfile.DiskHttpCache)
-            profile.setPersistentCookiesPolicy(QWebEngineProfile.ForcePersistentCookies)
-            cache_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation), "web_cache")
-            storage_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.DataLocation), "web_storage")
-            profile.setCachePath(cache_path)
-            profile.setPersistentStoragePath(storage_path)
-            
-            # アドブロッカー
-            blocked_urls = [
-                "*://*.doubleclick.net/*",
-                "*://*.googleadservices.com/*",
-                "*://*.googlesyndication.com/*",
-                "*://*.adservice.google.com/*",
-                "*://*.adbrite.com/*",
-                "*://*.exponential.com/*",
-                "*://*.quantserve.com/*",
-                "*://*.scorecardresearch.com/*"
-            ]
-            profile.setUrlRequestInterceptor(AdBlocker(blocked_urls))
+            # キャッシュ・アドブロッカー等のプロファイル設定
+            setup_default_profile()
 
             self.web_view.page().runJavaScript("""
                 const blockedDomains = [
@@ -252,6 +971,28 @@ class OptimizedBrowserTab(QWidget):
         if not ok:
             self.progress_bar.setStyleSheet("QProgressBar { background: transparent; border: 1px solid red; }")
             QTimer.singleShot(3000, lambda: self.progress_bar.setStyleSheet("QProgressBar { background: transparent; }"))
+        elif not self.private_mode:
+            # 全文インデックス (有効時のみ)
+            PageIndexer.instance().index_tab(self)
+            
+            # ファビコンとサムネイルのキャッシュ
+            url = self.web_view.url()
+            host = IconCache.host_of(url.toString())
+            if host:
+                # AutoLoadIconsForPageが無効だとiconUrl()は空なので、宣言されたアイコンをページから読む
+                fallback = f"{url.scheme()}://{host}/favicon.ico"
+                self.web_view.page().runJavaScript(
+                    "(function () {"
+                    "  var link = document.querySelector('link[rel~=\"icon\" i]');"
+                    "  return link ? link.href : '';"
+                    "})()",
+                    lambda href: IconCache.instance().update_icon(host, href or fallback))
+                QTimer.singleShot(500, lambda: self.capture_thumbnail(host))
+    
+    def capture_thumbnail(self, host):
+        # 非表示のビューは描画されないので、表示中のタブだけ撮る
+        if self.web_view.isVisible() and IconCache.host_of(self.web_view.url().toString()) == host:
+            IconCache.instance().store_thumbnail(host, self.web_view.grab())
     
     def go_back(self):
         self.web_view.back()
@@ -284,15 +1025,67 @@ class OptimizedBrowserTab(QWidget):
             QMessageBox.critical(self, "エラー", "ブックマーク追加中に問題が発生しました")
 
 class TabBrowser(QMainWindow):
-    def __init__(self):
+    # 遅延起動処理がすべて終わった
+    startup_finished = pyqtSignal()
+
+    def __init__(self, trace=None, deferred_startup=True):
         super().__init__()
+        self.trace = trace or StartupTrace()
         self.setWindowTitle("Shichiha Browser")
         self.setGeometry(100, 100, 1200, 800)
         self.bookmarks = {}
+        self.bookmark_buttons = []
         self.dark_mode = False
-        self.load_bookmarks()
-        self.setup_ui()
-        self.setup_extensions()
+        with self.trace.phase("bookmarks_load"):
+            self.load_bookmarks()
+        with self.trace.phase("window_setup"):
+            self.setup_ui()
+        
+        # ウィンドウ表示に必要ない処理は最初の描画の後に回す
+        self.startup_steps = [
+            ("icon_cache", lambda: IconCache.instance().updated.connect(self.on_icon_cache_updated)),
+            ("profile", setup_default_profile),
+            ("first_tab", lambda: self.add_new_tab(HOME_URL)),
+            ("bookmark_bar", self.setup_bookmark_bar),
+            ("menu_bar", self.setup_menu_bar),
+            ("extensions", self.setup_extensions),
+        ]
+        self.startup_started = False
+        if not deferred_startup:
+            # 比較用: 従来どおり表示前にすべて実行する
+            # (startup_completeは遅延起動と同じく表示後のrun_startup_stepで記録する)
+            while self.startup_steps:
+                self.run_startup_step(schedule_next=False)
+    
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.trace.mark("window_shown")
+        # 描画イベントが来ない環境向けの保険
+        QTimer.singleShot(100, self.start_deferred_startup)
+    
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.startup_started:
+            self.trace.mark("first_paint")
+            QTimer.singleShot(0, self.start_deferred_startup)
+    
+    def start_deferred_startup(self):
+        if self.startup_started:
+            return
+        self.startup_started = True
+        self.run_startup_step()
+    
+    def run_startup_step(self, schedule_next=True):
+        if not self.startup_steps:
+            self.trace.mark("startup_complete")
+            self.startup_finished.emit()
+            return
+        name, step = self.startup_steps.pop(0)
+        with self.trace.phase(name):
+            self.safe_execute(step)
+        if schedule_next:
+            # 1フェーズごとにイベントループへ戻して入力を止めない
+            QTimer.singleShot(0, self.run_startup_step)
     
     def safe_execute(self, func, *args, **kwargs):
         try:
@@ -321,14 +1114,10 @@ class TabBrowser(QMainWindow):
         self.main_layout.setSpacing(0)
         self.main_widget.setLayout(self.main_layout)
         
-        # メニューバー
-        self.setup_menu_bar()
-        
-        # ブックマークバー
+        # ブックマークバー (中身は遅延起動で作る)
         self.bookmark_bar = QHBoxLayout()
         self.bookmark_bar.setContentsMargins(5, 2, 5, 2)
         self.bookmark_bar.setSpacing(5)
-        self.setup_bookmark_bar()
         self.main_layout.addLayout(self.bookmark_bar)
         
         # タブウィジェット
@@ -344,9 +1133,6 @@ class TabBrowser(QMainWindow):
         self.new_tab_button.clicked.connect(lambda: self.add_new_tab())
         self.tabs.setCornerWidget(self.new_tab_button)
         
-        # 初期タブ
-        self.add_new_tab("https://www.google.com")
-        
         # ダークモード初期設定
         self.set_dark_mode(False)
     
@@ -370,6 +1156,12 @@ class TabBrowser(QMainWindow):
         
         file_menu.addSeparator()
         
+        search_pages_action = file_menu.addAction("閲覧ページを全文検索")
+        search_pages_action.setShortcut("Ctrl+Shift+F")
+        search_pages_action.triggered.connect(self.show_page_search)
+        
+        file_menu.addSeparator()
+        
         exit_action = file_menu.addAction("終了")
         exit_action.setShortcut("Ctrl+Q")
         exit_action.triggered.connect(self.close)
@@ -387,6 +1179,14 @@ class TabBrowser(QMainWindow):
         clear_cache_action = settings_menu.addAction("キャッシュをクリア")
         clear_cache_action.triggered.connect(self.clear_cache)
         
+        index_action = settings_menu.addAction("閲覧ページをインデックス")
+        index_action.setCheckable(True)
+        index_action.setChecked(PageIndexer.instance().enabled)
+        index_action.triggered.connect(lambda checked: PageIndexer.instance().set_enabled(checked))
+        
+        clear_index_action = settings_menu.addAction("インデックスを削除")
+        clear_index_action.triggered.connect(self.clear_page_index)
+        
         # ヘルプメニュー
         help_menu = menubar.addMenu("ヘルプ")
         
@@ -442,6 +1242,8 @@ class TabBrowser(QMainWindow):
         reply = QMessageBox.question(self, "確認", "すべてのキャッシュをクリアしますか？",
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
+            # アイコンキャッシュのデータベースもここにあるので、先に閉じておく
+            IconCache.instance().reset()
             cache_path = os.path.join(QStandardPaths.writableLocation(QStandardPaths.CacheLocation))
             for root, dirs, files in os.walk(cache_path):
                 for f in files:
@@ -450,6 +1252,17 @@ class TabBrowser(QMainWindow):
                     shutil.rmtree(os.path.join(root, d))
             QMessageBox.information(self, "完了", "キャッシュをクリアしました")
     
+    def show_page_search(self):
+        dialog = PageSearchDialog(self)
+        dialog.setAttribute(Qt.WA_DeleteOnClose)
+        dialog.show()
+    
+    def clear_page_index(self):
+        reply = QMessageBox.question(self, "確認", "閲覧ページのインデックスを削除しますか？",
+                                   QMessageBox.Yes | QMessageBox.No)
+        if reply == QMessageBox.Yes:
+            PageIndexer.instance().clear()
+    
     def new_window(self):
         new_window = TabBrowser()
         new_window.show()
@@ -630,6 +1443,8 @@ class TabBrowser(QMainWindow):
         
         tab.web_view.titleChanged.connect(
             lambda title, tab=tab: self.update_tab_title(tab, title))
+        tab.web_view.urlChanged.connect(
+            lambda url, tab=tab: self.update_tab_icon(tab))
         
         # ダークモード適用
         if self.dark_mode:
@@ -662,6 +1477,26 @@ class TabBrowser(QMainWindow):
             self.tabs.setTabText(index, short_title + private_suffix)
             self.tabs.setTabToolTip(index, f"{title}\n{tab.web_view.url().toString()}")
 
+    def update_tab_icon(self, tab):
+        index = self.tabs.indexOf(tab)
+        if index != -1:
+            host = IconCache.host_of(tab.web_view.url().toString())
+            icon = IconCache.instance().icon(host) if host else None
+            self.tabs.setTabIcon(index, icon or QIcon())
+    
+    def on_icon_cache_updated(self, key):
+        if not key.startswith("icon:"):
+            return
+        host = key[len("icon:"):]
+        for i in range(self.tabs.count()):
+            widget = self.tabs.widget(i)
+            if widget and IconCache.host_of(widget.web_view.url().toString()) == host:
+                self.update_tab_icon(widget)
+        icon = IconCache.instance().icon(host)
+        for button_host, button in self.bookmark_buttons:
+            if button_host == host and icon:
+                button.setIcon(icon)
+    
     def add_bookmark_safely(self, title, url):
         self.safe_execute(self._add_bookmark, title, url)
     
@@ -691,6 +1526,9 @@ class TabBrowser(QMainWindow):
         manage_button.setMenu(manage_menu)
         self.bookmark_bar.addWidget(manage_button)
         
+        # キャッシュ済みのファビコンを表示 (未デコード分は読み込み後にon_icon_cache_updatedで反映)
+        icon_cache = IconCache.instance()
+        self.bookmark_buttons = []
         for title, url in self.bookmarks.items():
             btn = QPushButton(title)
             btn.setToolTip(url)
@@ -706,31 +1544,248 @@ class TabBrowser(QMainWindow):
                     background: #e0e0e0;
                 }
             """)
+            host = IconCache.host_of(url)
+            icon = icon_cache.icon(host)
+            if icon:
+                btn.setIcon(icon)
+            self.bookmark_buttons.append((host, btn))
             btn.clicked.connect(lambda checked, u=url: self.open_bookmark_safely(u))
             self.bookmark_bar.addWidget(btn)
             
         self.bookmark_bar.addStretch(1)
 
+class BatchRenderer(QObject):
+    # ヘッドレス一括レンダリング: ページを使い回しながらURLを順に処理する
+    def __init__(self, urls, output_format="pdf", output_dir=".", pool_size=None,
+                 timeout=30, out=None, parent=None):
+        super().__init__(parent)
+        self.urls = list(enumerate(urls))
+        self.output_format = output_format
+        self.output_dir = output_dir
+        self.timeout = timeout
+        self.out = out or sys.stdout
+        self.total = len(self.urls)
+        self.pending = self.total
+        self.failures = 0
+        self.started = time.perf_counter()
+
+        if output_format != "text":
+            os.makedirs(output_dir, exist_ok=True)
+
+        # 通常タブと同じアドブロッカーを使う、ディスクに残らないプロファイル
+        self.profile = QWebEngineProfile(self)
+        self.profile.setHttpCacheType(QWebEngineProfile.MemoryHttpCache)
+        self.ad_blocker = AdBlocker(BLOCKED_URLS)
+        self.profile.setUrlRequestInterceptor(self.ad_blocker)
+
+        pool_size = max(1, min(pool_size or os.cpu_count() or 1, len(self.urls) or 1))
+        self.slots = [self.create_slot() for _ in range(pool_size)]
+
+    def create_slot(self):
+        view = QWebEngineView()
+        view.resize(1280, 800)
+        slot = {"view": view, "job": None, "rendering": None, "load_started": False,
+                "timer": QTimer(self)}
+        slot["timer"].setSingleShot(True)
+        slot["timer"].timeout.connect(lambda s=slot: self.finish(s, s["job"], error="timeout"))
+        self.attach_page(slot)
+        if self.output_format == "png":
+            # grab()には描画済みのウィジェットが必要 (offscreenプラットフォームでは画面に出ない)
+            view.show()
+        return slot
+
+    def attach_page(self, slot):
+        view = slot["view"]
+        page = QWebEnginePage(self.profile, view)
+        view.setPage(page)
+        settings = page.settings()
+        settings.setAttribute(QWebEngineSettings.JavascriptCanOpenWindows, False)
+        settings.setAttribute(QWebEngineSettings.PluginsEnabled, False)
+        settings.setAttribute(QWebEngineSettings.AutoLoadIconsForPage, False)
+
+        # シグナルは発火時点のjobを読むので、どのページから来たかで古い通知を見分ける
+        page.loadStarted.connect(lambda s=slot, p=page: self.page_load_started(s, p))
+        page.loadFinished.connect(lambda ok, s=slot, p=page: self.page_loaded(s, p, s["job"], ok))
+        page.pdfPrintingFinished.connect(
+            lambda path, ok, s=slot, p=page: self.pdf_finished(s, p, s["job"], path, ok))
+
+    def replace_page(self, slot):
+        # 中断したページの遅れてくるloadFinished等が次のURLに混ざらないよう、ページごと捨てる
+        old_page = slot["view"].page()
+        old_page.triggerAction(QWebEnginePage.Stop)
+        self.attach_page(slot)
+        old_page.deleteLater()
+
+    def start(self):
+        if not self.urls:
+            self.shutdown()
+            return
+        for slot in self.slots:
+            self.next_url(slot)
+
+    def next_url(self, slot):
+        if not self.urls:
+            slot["job"] = None
+            return
+        index, url = self.urls.pop(0)
+        # jobは古いシグナルを無視するための識別子を兼ねる
+        slot["job"] = (index, url, time.perf_counter())
+        slot["load_started"] = False
+        slot["timer"].start(int(self.timeout * 1000))
+        slot["view"].setUrl(QUrl.fromUserInput(url))
+
+    def page_load_started(self, slot, page):
+        if page is slot["view"].page() and slot["job"] is not None:
+            slot["load_started"] = True
+
+    def page_loaded(self, slot, page, job, ok):
+        # 現在のjobで読み込みを開始する前の通知は、前のURLのもの
+        if page is not slot["view"].page() or not slot["load_started"]:
+            return
+        # リダイレクト等で複数回通知されても描画は一度だけ
+        if job is None or slot["job"] is not job or slot["rendering"] is job:
+            return
+        slot["rendering"] = job
+        if not ok:
+            self.finish(slot, job, error="load failed")
+        elif self.output_format == "text":
+            slot["view"].page().toPlainText(lambda text: self.finish(slot, job, text=text))
+        elif self.output_format == "pdf":
+            slot["view"].page().printToPdf(self.output_path(job))
+        else:
+            # レイアウト確定後に描画する
+            QTimer.singleShot(200, lambda: self.grab_png(slot, job))
+
+    def grab_png(self, slot, job):
+        if slot["job"] is not job:
+            return
+        path = self.output_path(job)
+        if slot["view"].grab().save(path, "PNG"):
+            self.finish(slot, job, output=path)
+        else:
+            self.finish(slot, job, error="save failed")
+
+    def pdf_finished(self, slot, page, job, path, ok):
+        if job is None or slot["job"] is not job or page is not slot["view"].page():
+            return
+        if path != self.output_path(job):
+            return
+        if ok:
+            self.finish(slot, job, output=path)
+        else:
+            self.finish(slot, job, error="pdf failed")
+
+    def output_path(self, job):
+        return os.path.join(self.output_dir, f"{job[0]:05d}.{self.output_format}")
+
+    def finish(self, slot, job, output=None, text=None, error=None):
+        if job is None or slot["job"] is not job:
+            return
+        slot["timer"].stop()
+        slot["job"] = None
+        index, url, started = job
+
+        result = {
+            "index": index,
+            "url": url,
+            "ok": error is None,
+            "format": self.output_format,
+            "elapsed_ms": round((time.perf_counter() - started) * 1000),
+        }
+        if output is not None:
+            result["output"] = output
+        if text is not None:
+            result["text"] = text
+        if error is not None:
+            result["error"] = error
+            self.failures += 1
+            self.replace_page(slot)
+        self.out.write(json.dumps(result, ensure_ascii=False) + "\n")
+        self.out.flush()
+
+        self.pending -= 1
+        if self.pending == 0:
+            elapsed = time.perf_counter() - self.started
+            print(f"{self.total}件処理 (ページ数 {len(self.slots)}, "
+                  f"{self.total / elapsed * 60:.1f} ページ/分)", file=sys.stderr)
+            self.shutdown()
+        else:
+            self.next_url(slot)
+
+    def shutdown(self):
+        # ページはプロファイルより先に破棄しないといけないので、イベントループ内でビューごと消してから終了する
+        for slot in self.slots:
+            slot["timer"].stop()
+            slot["view"].deleteLater()
+        self.slots = []
+        QTimer.singleShot(0, QApplication.instance().quit)
+
+def read_url_list(path):
+    if path == "-":
+        lines = sys.stdin.read().splitlines()
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            lines = f.read().splitlines()
+    return [line.strip() for line in lines if line.strip() and not line.strip().startswith('#')]
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Shichiha Browser")
+    parser.add_argument("--batch", metavar="FILE",
+                        help="URLリストを一括レンダリングする (-で標準入力)")
+    parser.add_argument("--format", choices=["pdf", "png", "text"], default="pdf",
+                        help="出力形式 (既定: pdf)")
+    parser.add_argument("--output-dir", default=".", help="出力先ディレクトリ")
+    parser.add_argument("--pool-size", type=int, default=os.cpu_count() or 1,
+                        help="同時に使うページ数 (既定: CPUコア数)")
+    parser.add_argument("--timeout", type=float, default=30, help="URLごとのタイムアウト秒数")
+    parser.add_argument("--trace-startup", metavar="FILE",
+                        help="起動の各フェーズの時間をJSONで書き出す (-で標準出力)")
+    parser.add_argument("--eager-startup", action="store_true",
+                        help="起動処理を遅延せずウィンドウ表示前にすべて行う (比較用)")
+    parser.add_argument("--quit-after-startup", action="store_true",
+                        help="起動処理が終わったら終了する (計測用)")
+    # 残りの引数はQtに渡す
+    return parser.parse_known_args(argv[1:])
+
+def run_batch(args, qt_args):
+    # ウィンドウを出さないoffscreenプラットフォームで動かす
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    app = QApplication([sys.argv[0]] + qt_args)
+    app.setApplicationName("Shichiha Browser")
+    app.setOrganizationName("GomaShichiha")
+
+    renderer = BatchRenderer(read_url_list(args.batch), args.format, args.output_dir,
+                             args.pool_size, args.timeout)
+    renderer.start()
+    app.exec_()
+    return 1 if renderer.failures else 0
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    args, qt_args = parse_args(sys.argv)
+    if args.batch:
+        sys.exit(run_batch(args, qt_args))
+
+    trace = StartupTrace(args.trace_startup, _STARTUP_ORIGIN)
+    trace.add("imports", _STARTUP_ORIGIN, _IMPORTS_FINISHED)
     
-    # 高DPI対応
+    # 高DPI対応 (QApplication生成前に設定しないと効かない)
     if hasattr(Qt, 'AA_EnableHighDpiScaling'):
         QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     if hasattr(Qt, 'AA_UseHighDpiPixmaps'):
         QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
     
+    with trace.phase("qapplication"):
+        app = QApplication([sys.argv[0]] + qt_args)
+    
     # アプリケーション設定
     app.setApplicationName("Shichiha Browser")
     app.setApplicationVersion("1.2.1")
     app.setOrganizationName("GomaShichiha")
     
-    browser = TabBrowser()
+    browser = TabBrowser(trace, deferred_startup=not args.eager_startup)
+    browser.startup_finished.connect(trace.write)
+    if args.quit_after_startup:
+        browser.startup_finished.connect(app.quit)
     browser.show()
     
-    # メモリリーク防止
-    timer = QTimer()
-    timer.timeout.connect(lambda: None)
-    timer.start(1000)
-    
     sys.exit(app.exec_())